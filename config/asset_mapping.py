@@ -1,8 +1,6 @@
 import ujson as json
 from dataclasses import dataclass
 from collections import OrderedDict
-from signal_processors.tradingview_processor import TradingViewProcessor
-from signal_processors.bittensor_processor import BittensorProcessor
 
 CONFIG_FILE = "asset_mapping_config.json"
 
@@ -13,6 +11,11 @@ class SignalSource:
 
 def load_signal_sources():
     """Fetch each signal source."""
+    # Imported here so importing this module (or its dataclasses) does not pull in
+    # the processors' HTTP, numpy and credentials stack
+    from signal_processors.tradingview_processor import TradingViewProcessor
+    from signal_processors.bittensor_processor import BittensorProcessor
+
     tv = TradingViewProcessor()
     bt = BittensorProcessor()
     return [
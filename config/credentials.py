@@ -1,61 +1,74 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import Optional
 
-@dataclass
+@dataclass(slots=True)
 class BittensorCredentials:
     api_key: str
     endpoint: str
 
-@dataclass
+@dataclass(slots=True)
 class BybitCredentials:
     api_key: str
     api_secret: str
 
-@dataclass
+@dataclass(slots=True)
 class BloFinCredentials:
     api_key: str
     api_secret: str
     api_passphrase: str
 
-@dataclass
+@dataclass(slots=True)
 class KuCoinCredentials:
     api_key: str
     api_secret: str
     api_passphrase: str
     
-@dataclass
+@dataclass(slots=True)
 class MEXCCredentials:
     api_key: str
     api_secret: str
 
-@dataclass
+@dataclass(slots=True)
 class Credentials:
     bittensor_sn8: BittensorCredentials
     bybit: BybitCredentials
     blofin: BloFinCredentials
     kucoin: KuCoinCredentials
     mexc: MEXCCredentials
+    # Hash of the bytes last read from or written to disk; not serialized
+    _source_hash: Optional[int] = field(default=None, init=False, repr=False, compare=False)
 
 
-import ujson
+import functools
+import orjson
 import os
+from core.utils.file_io import read_bytes, write_atomic
 
 CREDENTIALS_FILE = "credentials.json"
 
-def load_credentials(file_path: str) -> Credentials:
-    """Load credentials from a JSON file."""
-    if not os.path.exists(file_path):
-        # Return default Credentials objects when the file is not found
-        return Credentials(
-            bittensor_sn8=BittensorCredentials(api_key="", endpoint=""),
-            bybit=BybitCredentials(api_key="", api_secret=""),
-            blofin=BloFinCredentials(api_key="", api_secret="", api_passphrase=""),
-            kucoin=KuCoinCredentials(api_key="", api_secret="", api_passphrase=""),
-            mexc=MEXCCredentials(api_key="", api_secret=""),
-        )
+def _empty_credentials() -> Credentials:
+    """Return fresh, empty credentials for when no credentials file exists yet."""
+    # Built directly each time: the ensure_* helpers assign into the nested
+    # per-exchange records, so nothing here may be shared between calls
+    return Credentials(
+        bittensor_sn8=BittensorCredentials(api_key="", endpoint=""),
+        bybit=BybitCredentials(api_key="", api_secret=""),
+        blofin=BloFinCredentials(api_key="", api_secret="", api_passphrase=""),
+        kucoin=KuCoinCredentials(api_key="", api_secret="", api_passphrase=""),
+        mexc=MEXCCredentials(api_key="", api_secret=""),
+    )
+
+@functools.lru_cache(maxsize=4)
+def _cached_load(file_path: str, mtime_ns: int, inode: int):
+    """Parse the credentials file; keyed on its mtime and inode so edits invalidate the entry.
 
-    with open(file_path, 'r', encoding='utf-8') as f:
-        data = ujson.load(f)
+    Returns the parsed dict (treat as read-only) and the hash of the raw bytes.
+    """
+    with read_bytes(file_path) as raw:
+        return orjson.loads(raw), hash(raw)
 
+def _build_credentials(data: dict) -> Credentials:
+    """Build fresh credential records from the parsed file contents."""
     bittensor_creds = data.get('bittensor_sn8', {})
     bybit_creds = data.get('bybit', {})
     blofin_creds = data.get('blofin', {})
@@ -87,29 +100,56 @@ def load_credentials(file_path: str) -> Credentials:
         ),
     )
 
+def load_credentials(file_path: str) -> Credentials:
+    """Load credentials from a JSON file."""
+    try:
+        # save_credentials replaces the file, so a new inode also marks it as changed
+        st = os.stat(file_path)
+        data, source_hash = _cached_load(file_path, st.st_mtime_ns, st.st_ino)
+    except FileNotFoundError:
+        # Return default Credentials objects when the file is not found
+        return _empty_credentials()
+    # Fresh records on every call: the ensure_* helpers assign into them
+    credentials = _build_credentials(data)
+    credentials._source_hash = source_hash
+    return credentials
+
 def save_credentials(credentials: Credentials, file_path: str):
     """Save credentials to a JSON file."""
-    data = {
-        'bittensor_sn8': credentials.bittensor_sn8.__dict__ if credentials.bittensor_sn8 else None,
-        'bybit': credentials.bybit.__dict__ if credentials.bybit else None,
-        'blofin': credentials.blofin.__dict__ if credentials.blofin else None,
-        'kucoin': credentials.kucoin.__dict__ if credentials.kucoin else None,
-        'mexc': credentials.mexc.__dict__ if credentials.mexc else None,
-    }
-    with open(file_path, 'w', encoding='utf-8') as f:
-        ujson.dump(data, f, indent=4)
+    # orjson serializes the dataclass tree natively, no intermediate dicts
+    payload = orjson.dumps(credentials, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE)
+
+    # Nothing changed since the file was loaded or last saved, skip the write
+    payload_hash = hash(payload)
+    if credentials._source_hash == payload_hash:
+        return
+
+    write_atomic(file_path, payload, fsync=True)
+    credentials._source_hash = payload_hash
+
+_YES_ANSWERS = ('y', 'yes')
+_NO_ANSWERS = ('n', 'no')
+
+def _yesno(prompt: str, default: bool = False) -> bool:
+    """Ask a yes/no question; an empty answer returns `default`."""
+    while True:
+        answer = input(prompt).strip().lower()
+        if not answer:
+            return default
+        if answer in _YES_ANSWERS:
+            return True
+        if answer in _NO_ANSWERS:
+            return False
+        print("Please enter 'yes' or 'no'.")
 
 def prompt_for_changes(credentials_name: str, skip_prompt: bool = False) -> bool:
     """Ask the user if they want to change the credentials."""
-    while not skip_prompt:
-        change = input(f"{credentials_name} credentials are already set. Do you want to change them? (yes/no): ").strip().lower()
-        if change in ['yes', 'no']:
-            return change == 'yes'
-        print("Please enter 'yes' or 'no'.")
-    return False
+    if skip_prompt:
+        return False
+    return _yesno(f"{credentials_name} credentials are already set. Do you want to change them? (yes/no) [no]: ")
 
 
-def ensure_bittensor_credentials(credentials: Credentials, skip_prompt: bool = False) -> Credentials:
+def ensure_bittensor_credentials(credentials: Credentials, skip_prompt: bool = False, defer_save: bool = False) -> Credentials:
     """Prompt for Bittensor credentials if they don't exist, or ask to change them."""
     # Ask if the user wants to change existing credentials
     if credentials.bittensor_sn8.api_key and credentials.bittensor_sn8.endpoint and not prompt_for_changes("Bittensor SN8", skip_prompt):
@@ -123,10 +163,11 @@ def ensure_bittensor_credentials(credentials: Credentials, skip_prompt: bool = F
         endpoint = input("Enter the Bittensor endpoint URL: ")
         credentials.bittensor_sn8.endpoint = endpoint
 
-    save_credentials(credentials, CREDENTIALS_FILE)
+    if not defer_save:
+        save_credentials(credentials, CREDENTIALS_FILE)
     return credentials
 
-def ensure_bybit_credentials(credentials: Credentials, skip_prompt: bool = False) -> Credentials:
+def ensure_bybit_credentials(credentials: Credentials, skip_prompt: bool = False, defer_save: bool = False) -> Credentials:
     """Prompt for Bybit API credentials if they don't exist, or ask to change them."""
     # Ask if the user wants to change existing credentials
     if credentials.bybit.api_key and credentials.bybit.api_secret and not prompt_for_changes("Bybit",skip_prompt):
@@ -140,10 +181,11 @@ def ensure_bybit_credentials(credentials: Credentials, skip_prompt: bool = False
         api_secret = input("Enter your Bybit API secret: ")
         credentials.bybit.api_secret = api_secret
 
-    save_credentials(credentials, CREDENTIALS_FILE)
+    if not defer_save:
+        save_credentials(credentials, CREDENTIALS_FILE)
     return credentials
 
-def ensure_blofin_credentials(credentials: Credentials, skip_prompt: bool = False) -> Credentials:
+def ensure_blofin_credentials(credentials: Credentials, skip_prompt: bool = False, defer_save: bool = False) -> Credentials:
     """Prompt for BloFin API credentials if they don't exist, or ask to change them."""
     if credentials.blofin.api_key and credentials.blofin.api_secret and credentials.blofin.api_passphrase and not prompt_for_changes("BloFin", skip_prompt):
         return credentials
@@ -160,10 +202,11 @@ def ensure_blofin_credentials(credentials: Credentials, skip_prompt: bool = Fals
         passphrase = input("Enter your BloFin API passphrase: ")
         credentials.blofin.api_passphrase = passphrase
 
-    save_credentials(credentials, CREDENTIALS_FILE)
+    if not defer_save:
+        save_credentials(credentials, CREDENTIALS_FILE)
     return credentials
 
-def ensure_kucoin_credentials(credentials: Credentials, skip_prompt: bool = False) -> Credentials:
+def ensure_kucoin_credentials(credentials: Credentials, skip_prompt: bool = False, defer_save: bool = False) -> Credentials:
     """Prompt for KuCoin API credentials if they don't exist, or ask to change them."""
     if credentials.kucoin.api_key and credentials.kucoin.api_secret and credentials.kucoin.api_passphrase and not prompt_for_changes("KuCoin", skip_prompt):
         return credentials
@@ -180,10 +223,11 @@ def ensure_kucoin_credentials(credentials: Credentials, skip_prompt: bool = Fals
         passphrase = input("Enter your KuCoin API passphrase: ")
         credentials.kucoin.api_passphrase = passphrase
 
-    save_credentials(credentials, CREDENTIALS_FILE)
+    if not defer_save:
+        save_credentials(credentials, CREDENTIALS_FILE)
     return credentials
 
-def ensure_mexc_credentials(credentials: Credentials, skip_prompt: bool = False) -> Credentials:
+def ensure_mexc_credentials(credentials: Credentials, skip_prompt: bool = False, defer_save: bool = False) -> Credentials:
     """Prompt for MEXC API credentials if they don't exist, or ask to change them."""
     if credentials.mexc.api_key and credentials.mexc.api_secret and not prompt_for_changes("MEXC", skip_prompt):
         return credentials
@@ -196,55 +240,56 @@ def ensure_mexc_credentials(credentials: Credentials, skip_prompt: bool = False)
         api_secret = input("Enter your MEXC API secret: ")
         credentials.mexc.api_secret = api_secret
 
-    save_credentials(credentials, CREDENTIALS_FILE)
+    if not defer_save:
+        save_credentials(credentials, CREDENTIALS_FILE)
     return credentials
 
 
-def load_bittensor_credentials():
-    """Ensure all credentials are present, and load them if necessary."""
+# Exchange name -> ensure_* helper, shared by the load_* helpers and the interactive setup
+_ENSURE = {
+    'bittensor': ensure_bittensor_credentials,
+    'bybit': ensure_bybit_credentials,
+    'blofin': ensure_blofin_credentials,
+    'kucoin': ensure_kucoin_credentials,
+    'mexc': ensure_mexc_credentials,
+}
+
+def _load(name: str) -> Credentials:
+    """Load credentials and make sure the ones for `name` are present."""
     credentials = load_credentials(CREDENTIALS_FILE)
-    assert ensure_bittensor_credentials(credentials, skip_prompt=True)
-    
+    _ENSURE[name](credentials, skip_prompt=True)
     return credentials
 
-def load_bybit_credentials():
+def load_bittensor_credentials() -> Credentials:
     """Ensure all credentials are present, and load them if necessary."""
-    credentials = load_credentials(CREDENTIALS_FILE)
-    assert ensure_bybit_credentials(credentials, skip_prompt=True)
-    
-    return credentials
+    return _load('bittensor')
+
+def load_bybit_credentials() -> Credentials:
+    """Ensure all credentials are present, and load them if necessary."""
+    return _load('bybit')
 
-def load_blofin_credentials():
+def load_blofin_credentials() -> Credentials:
     """Ensure all BloFin credentials are present, and load them if necessary."""
-    credentials = load_credentials(CREDENTIALS_FILE)
-    assert ensure_blofin_credentials(credentials, skip_prompt=True)
-    return credentials
+    return _load('blofin')
 
-def load_kucoin_credentials():
+def load_kucoin_credentials() -> Credentials:
     """Ensure all KuCoin credentials are present, and load them if necessary."""
-    credentials = load_credentials(CREDENTIALS_FILE)
-    assert ensure_kucoin_credentials(credentials, skip_prompt=True)
-    return credentials
+    return _load('kucoin')
 
 def load_mexc_credentials() -> Credentials:
     """Ensure all MEXC credentials are present, and load them if necessary."""
-    credentials = load_credentials(CREDENTIALS_FILE)
-    assert ensure_mexc_credentials(credentials, skip_prompt=True)
-    return credentials
+    return _load('mexc')
 
 
 def prompt_for_credentials(file_path: str):
     """Ensure all necessary credentials are present by prompting the user."""
     credentials = load_credentials(file_path)
     
-    # Prompt for Bybit and Bittensor credentials or ask to change them
-    credentials = ensure_bittensor_credentials(credentials)
-    credentials = ensure_bybit_credentials(credentials)
-    credentials = ensure_blofin_credentials(credentials)
-    credentials = ensure_kucoin_credentials(credentials)
-    credentials = ensure_mexc_credentials(credentials)
+    # Prompt for each exchange's credentials or ask to change them
+    for ensure in _ENSURE.values():
+        credentials = ensure(credentials, defer_save=True)
     
-    # Save the updated credentials
+    # Save the updated credentials once, after every exchange has been visited
     save_credentials(credentials, file_path)
     
     print("Credentials have been updated and saved.")
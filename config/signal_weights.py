@@ -1,105 +1,127 @@
-import ujson as json
-from dataclasses import dataclass, asdict
-from signal_processors.tradingview_processor import TradingViewProcessor
-from signal_processors.bittensor_processor import BittensorProcessor
+import functools
+import os
+import orjson
+from dataclasses import dataclass
+from typing import NamedTuple
+from prompt_toolkit import prompt
+from prompt_toolkit.validation import ValidationError, Validator
+from config.asset_mapping import load_signal_sources
+from core.utils.file_io import load_json, write_atomic
 
 CONFIG_FILE = "signal_weight_config.json"
 STARTING_WEIGHT = 1.0
+# Set SIGNAL_WEIGHTS_COMPACT=1 to save the config without indentation
+COMPACT_JSON = os.environ.get("SIGNAL_WEIGHTS_COMPACT", "0") == "1"
 
-@dataclass
-class SignalSource:
-    name: str
-    core_asset_mapping: dict
-
-@dataclass
-class SourceWeight:
+class SourceWeight(NamedTuple):
     source: str
     weight: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class UnifiedSymbolConfig:
     symbol: str
     leverage: int
     sources: list[SourceWeight]
 
-def load_signal_sources():
-    """Fetch each signal source."""
-    tv = TradingViewProcessor()
-    bt = BittensorProcessor()
-    return [
-        SignalSource(name=tv.SIGNAL_SOURCE, core_asset_mapping=tv.CORE_ASSET_MAPPING),
-        SignalSource(name=bt.SIGNAL_SOURCE, core_asset_mapping=bt.CORE_ASSET_MAPPING),
-    ]
+def _to_dict(config: UnifiedSymbolConfig) -> dict:
+    """Convert a symbol config to its JSON shape without dataclasses.asdict's deep copy."""
+    return {
+        "symbol": config.symbol,
+        "leverage": config.leverage,
+        "sources": [{"source": sw.source, "weight": sw.weight} for sw in config.sources],
+    }
+
+@functools.lru_cache(maxsize=4)
+def _cached_load(mtime_ns: int, inode: int) -> tuple:
+    """Parse CONFIG_FILE; keyed on its mtime and inode so an edited file is re-read."""
+    config_data = load_json(CONFIG_FILE)
+    configs = []
+    for config in config_data:
+        # Convert the sources list of dicts to list of SourceWeight objects
+        sources = [SourceWeight(**source) for source in config['sources']]
+        config['sources'] = sources
+        configs.append(UnifiedSymbolConfig(**config))
+    return tuple(configs)
 
 def load_existing_config():
     """Load existing configuration if available."""
     try:
-        with open(CONFIG_FILE, 'r', encoding='utf-8') as f:
-            config_data = json.load(f)
-            configs = []
-            for config in config_data:
-                # Convert the sources list of dicts to list of SourceWeight objects
-                sources = [SourceWeight(**source) for source in config['sources']]
-                config['sources'] = sources
-                configs.append(UnifiedSymbolConfig(**config))
-            return configs
-    except (FileNotFoundError, json.JSONDecodeError):
+        # save_config replaces the file, so a new inode marks a rewrite within one mtime tick
+        st = os.stat(CONFIG_FILE)
+        return list(_cached_load(st.st_mtime_ns, st.st_ino))
+    except (FileNotFoundError, orjson.JSONDecodeError):
         return []
 
-def get_existing_config(symbol, existing_configs):
-    """Get existing configuration for a symbol if it exists."""
-    for config in existing_configs:
-        if config.symbol == symbol:
-            return config
-    return None
+class _CheckValidator(Validator):
+    """Validator driven by a check(text) callable that returns an error message or None."""
+
+    def __init__(self, check):
+        self._check = check
+
+    def validate(self, document):
+        error = self._check(document.text.strip())
+        if error:
+            raise ValidationError(message=error, cursor_position=len(document.text))
 
 def prompt_for_leverage(symbol, existing_leverage=None):
     """Prompt the user to assign leverage for a symbol."""
     default_msg = f" (press Enter for current value: {existing_leverage})" if existing_leverage else ""
-    while True:
+
+    def check(text):
+        if not text and existing_leverage is not None:
+            return None
         try:
-            leverage = input(f"Enter leverage for {symbol}{default_msg}: ").strip()
-            if not leverage and existing_leverage is not None:
-                return existing_leverage
-            return int(leverage)
+            int(text)
         except ValueError:
-            print("Please enter an integer value for leverage.")
+            return "Please enter an integer value for leverage."
+        return None
+
+    # Invalid input is rejected in place instead of re-printing the whole prompt
+    leverage = prompt(f"Enter leverage for {symbol}{default_msg}: ", validator=_CheckValidator(check)).strip()
+    if not leverage:
+        return existing_leverage
+    return int(leverage)
 
 def prompt_for_weight(symbol, source_name, remaining_weight, existing_weight=None):
     """Prompt user to assign a weight for a given source."""
     default_msg = f" (press Enter for current value: {existing_weight})" if existing_weight is not None else " (press Enter to skip)"
-    while True:
+
+    def check(text):
+        if not text:
+            return None
         try:
-            weight = input(
-                f"Assign weight for {symbol} from {source_name} "
-                f"(remaining weight: {remaining_weight:.2f}{default_msg}): "
-            ).strip()
-            if not weight:
-                return existing_weight if existing_weight is not None else 0.0
-            weight = float(weight)
-            if 0 <= weight <= remaining_weight:
-                return weight
-            print(f"Weight must be between 0 and {remaining_weight:.2f}. Try again.")
+            weight = float(text)
         except ValueError:
-            print("Please enter a numeric value.")
+            return "Please enter a numeric value."
+        if not 0 <= weight <= remaining_weight:
+            return f"Weight must be between 0 and {remaining_weight:.2f}. Try again."
+        return None
+
+    weight = prompt(
+        f"Assign weight for {symbol} from {source_name} "
+        f"(remaining weight: {remaining_weight:.2f}{default_msg}): ",
+        validator=_CheckValidator(check),
+    ).strip()
+    if not weight:
+        return existing_weight if existing_weight is not None else 0.0
+    return float(weight)
 
 def configure_signals(signal_sources):
     """Configure weights and leverage for unified symbols."""
     unified_symbols = {}
     existing_configs = load_existing_config()
+    existing_by_symbol = {config.symbol: config for config in existing_configs}
 
     # Build unified symbol mappings
     for source in signal_sources:
-        for _, unified_symbol in source.core_asset_mapping.items():
-            if unified_symbol not in unified_symbols:
-                unified_symbols[unified_symbol] = []
-            unified_symbols[unified_symbol].append(source.name)
+        for unified_symbol in source.core_asset_mapping.values():
+            unified_symbols.setdefault(unified_symbol, []).append(source.name)
 
     asset_configs = []
 
     for unified_symbol, sources in unified_symbols.items():
         print(f"\nConfiguring {unified_symbol}")
-        existing_config = get_existing_config(unified_symbol, existing_configs)
+        existing_config = existing_by_symbol.get(unified_symbol)
         
         # Get existing leverage if available
         existing_leverage = existing_config.leverage if existing_config else None
@@ -107,22 +129,23 @@ def configure_signals(signal_sources):
         
         remaining_weight = STARTING_WEIGHT
         source_weights = []
+        existing_source_weights = (
+            {sw.source: sw.weight for sw in existing_config.sources} if existing_config else {}
+        )
 
         for source_name in sources:
             # Get existing weight if available
-            existing_weight = None
-            if existing_config:
-                for source_weight in existing_config.sources:
-                    if source_weight.source == source_name:
-                        existing_weight = source_weight.weight
-                        break
+            existing_weight = existing_source_weights.get(source_name)
             
             weight = prompt_for_weight(unified_symbol, source_name, remaining_weight, existing_weight)
             if weight > 0:
                 source_weights.append(SourceWeight(source=source_name, weight=weight))
                 remaining_weight -= weight
 
-            assert remaining_weight >= 0, "Remaining weight should not be negative."
+        # prompt_for_weight caps each answer at the remaining weight, so this only
+        # needs checking once per symbol rather than after every source
+        if remaining_weight < 0:
+            raise RuntimeError(f"Remaining weight for {unified_symbol} should not be negative.")
 
         asset_configs.append(UnifiedSymbolConfig(
             symbol=unified_symbol, leverage=leverage, sources=source_weights
@@ -135,25 +158,23 @@ def print_summary(asset_configs):
     total_weight_used = sum(
         weight.weight for config in asset_configs for weight in config.sources
     )
-    summary = "\nSummary of Allocated Weights:\n"
+    parts = [
+        f"\nTotal Weight Budget Used: {total_weight_used:.2f} out of {STARTING_WEIGHT}\n",
+        "\nSummary of Allocated Weights:\n",
+    ]
     for config in asset_configs:
-        summary += (
-            f"\nUnified Symbol: {config.symbol}, Leverage: {config.leverage}\n"
-        )
+        parts.append(f"\nUnified Symbol: {config.symbol}, Leverage: {config.leverage}\n")
         for source_weight in config.sources:
-            summary += (
-                f"  Source: {source_weight.source}, Weight: {source_weight.weight}\n"
-            )
-    print(f"\nTotal Weight Budget Used: {total_weight_used:.2f} out of {STARTING_WEIGHT}\n{summary}")
+            parts.append(f"  Source: {source_weight.source}, Weight: {source_weight.weight}\n")
+    print("".join(parts))
 
 def save_config(asset_configs):
     """Save the configuration data to a JSON file and print a summary."""
-    config_data = [asdict(config) for config in asset_configs]
+    config_data = [_to_dict(config) for config in asset_configs]
 
     print_summary(asset_configs)
 
-    with open(CONFIG_FILE, 'w', encoding='utf-8') as f:
-        json.dump(config_data, f, indent=4)
+    write_atomic(CONFIG_FILE, orjson.dumps(config_data, option=None if COMPACT_JSON else orjson.OPT_INDENT_2))
     print(f"\nConfiguration saved to {CONFIG_FILE}")
 
 def main():
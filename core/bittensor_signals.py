@@ -1,9 +1,8 @@
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, NamedTuple
 
 
-@dataclass
-class BTTSN8TradePair:
+class BTTSN8TradePair(NamedTuple):
     symbol: str
     original_symbol: str
     pair: str
@@ -12,7 +11,7 @@ class BTTSN8TradePair:
     decimal_places: int
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BTTSN8Order:
     leverage: float
     order_type: str  # "LONG", "SHORT", "LIMIT", "MARKET", etc.
@@ -24,7 +23,7 @@ class BTTSN8Order:
     trade_pair: BTTSN8TradePair
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BTTSN8Position:
     depth: float
     average_entry_price: float
@@ -41,7 +40,7 @@ class BTTSN8Position:
     trade_pair: BTTSN8TradePair
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BTTSN8MinerSignal:
     all_time_returns: float
     n_positions: int
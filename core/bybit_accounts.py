@@ -1,14 +1,13 @@
 from dataclasses import dataclass, field
-from typing import List
+from typing import List, NamedTuple
 
-@dataclass
-class BybitBalance:
+class BybitBalance(NamedTuple):
     asset: str
     available_balance: float
     wallet_balance: float
     unrealized_pnl: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BybitPosition:
     symbol: str
     side: str  # "Buy" or "Sell"
@@ -17,7 +16,7 @@ class BybitPosition:
     size: float
     unrealized_pnl: float
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BybitOrder:
     order_id: str
     symbol: str
@@ -28,7 +27,7 @@ class BybitOrder:
     time_in_force: str  # "GTC", "IOC", etc.
     status: str  # "New", "Filled", etc.
 
-@dataclass
+@dataclass(slots=True)
 class BybitAccountState:
     balances: List[BybitBalance] = field(default_factory=list)
     open_positions: List[BybitPosition] = field(default_factory=list)
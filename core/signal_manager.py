@@ -1,85 +1,173 @@
-import json
 import logging
 import os
+import numpy as np
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from core.utils.file_io import load_json, write_atomic
 from typing import Dict, List, Set
 import importlib
-import inspect
+import sys
 
 logger = logging.getLogger(__name__)
 
+# Depths are compared in fixed point at this resolution, so float noise below it
+# (e.g. from summing weights in a different order) doesn't trigger a rebalance
+DEPTH_SCALE = 1e10
+
+# Shared default for missing lookups; read-only by convention, never mutate it
+_EMPTY = {}
+
+def _cached_import(module_name: str):
+    """Return an already imported module straight from sys.modules, importing it otherwise."""
+    module = sys.modules.get(module_name)
+    if module is None:
+        module = importlib.import_module(module_name)
+    return module
+
+def _quantize_depths(depths: np.ndarray) -> np.ndarray:
+    """Scale depths to whole numbers at DEPTH_SCALE resolution for change detection."""
+    return np.rint(depths * DEPTH_SCALE)
+
 class SignalManager:
     CACHE_FILE = "account_asset_depths.json"
     CONFIG_FILE = "signal_weight_config.json"
     ASSET_MAPPING_CONFIG = "asset_mapping_config.json"
     SIGNAL_PROCESSORS_DIR = "signal_processors"
     ACCOUNT_PROCESSORS_DIR = "account_processors"
+    # Signal source -> processor class name in SIGNAL_PROCESSORS_DIR/{source}_processor.py,
+    # for names that don't follow the {Source}Processor convention
+    SIGNAL_PROCESSOR_CLASSES = {
+        "tradingview": "TradingViewProcessor",
+    }
+    # (module in ACCOUNT_PROCESSORS_DIR, account processor class name)
+    ACCOUNT_PROCESSORS = (
+        ("bybit_processor", "ByBit"),
+        ("kucoin_processor", "KuCoin"),
+        ("blofin_processor", "BloFin"),
+        ("mexc_processor", "MEXC"),
+    )
     
     def __init__(self):
         self.signal_processors = {}  # {source_name: processor_instance}
         self.account_processors = {}  # {account_name: processor_instance}
         self.account_asset_depths = {}  # {account_name: {asset: depth}}
+        self._config_stamp = None  # (mtime_ns, inode) of the config file behind self.config
         self.config = self._load_config()
+        self._rebuild_config_indexes()
         self.previous_signals = {}  # Track previous raw signals
+        self.previous_signal_keys = {}  # {source: {symbol: (depth, timestamp)}} of the previous signals
+        self._signal_hashes = {}  # {source: hash of the raw signals last fetched}
+        self._depth_columns = {}  # {source: depth per config symbol from the last signals compared}
+        self._settled_state = None  # Inputs of the last tick that needed no depth changes
         self._temp_depths = {}  # Initialize temp depths
+        self._pending_saves = set()  # Accounts confirmed since the cache was last written
         self._load_cache()
         self._initialize_processors()
+        # Reused across ticks; spinning up a fresh pool per tick cost more than the overlap saved
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=max(len(self.signal_processors), 1), thread_name_prefix="signal-fetch"
+        )
         self.processors = self.signal_processors  # For compatibility with existing code
         self._last_asset_mapping_check = 0  # Track last time we checked asset mapping config
     
     def _load_config(self) -> dict:
-        """Load signal weight configuration."""
+        """Load signal weight configuration, reusing the parsed copy while the file is unchanged."""
         try:
-            with open(self.CONFIG_FILE, 'r') as f:
-                return json.load(f)
+            # signal_weights.save_config replaces the file, so a new inode also marks a change
+            # that lands within the same mtime tick
+            st = os.stat(self.CONFIG_FILE)
+            stamp = (st.st_mtime_ns, st.st_ino)
+            if stamp == self._config_stamp:
+                return self.config
+            config = load_json(self.CONFIG_FILE)
+            self._config_stamp = stamp
+            return config
         except Exception as e:
             logger.error(f"Error loading config: {e}")
+            self._config_stamp = None
             return {}
     
+    def _rebuild_config_indexes(self):
+        """Index self.config by symbol so lookups don't rescan the config list."""
+        self._sources_by_symbol = {sc['symbol']: sc['sources'] for sc in self.config}
+        self._leverage_by_symbol = {sc['symbol']: sc['leverage'] for sc in self.config}
+        self._symbols = list(self._sources_by_symbol)
+        # One walk over the sources collects both:
+        # - (source, weight) pairs that actually contribute to each symbol's depth (weight > 0)
+        # - unique signal sources, in the order they first appear
+        self._weighted_sources = {}
+        unique_sources = {}
+        for symbol, sources in self._sources_by_symbol.items():
+            pairs = self._weighted_sources[symbol] = []
+            for source_config in sources:
+                source = source_config['source']
+                unique_sources[source] = None
+                if source_config['weight'] > 0:
+                    pairs.append((source, source_config['weight']))
+        self._unique_sources = list(unique_sources)
+        self._symbol_sources = {
+            symbol: [source for source, _ in pairs] for symbol, pairs in self._weighted_sources.items()
+        }
+        
+        # Weights in CSR form: one cell per (symbol, source) with a positive weight, in
+        # symbol order, so each weighted symbol's cells form one contiguous segment
+        self._source_index = {}
+        self._weighted_rows_by_source = {}  # {source: {symbol_idx whose weight for source > 0}}
+        cells = []
+        for i, pairs in enumerate(self._weighted_sources.values()):
+            for source, weight in pairs:
+                j = self._source_index.setdefault(source, len(self._source_index))
+                self._weighted_rows_by_source.setdefault(source, set()).add(i)
+                cells.append((i, j, weight))
+        self._cell_rows = np.array([i for i, _, _ in cells], dtype=np.intp)
+        self._cell_cols = np.array([j for _, j, _ in cells], dtype=np.intp)
+        self._cell_weights = np.array([weight for _, _, weight in cells], dtype=np.float64)
+        # Start of each symbol's segment; symbols with no positive weight get no target depth at all
+        self._segment_starts = np.flatnonzero(np.r_[True, self._cell_rows[1:] != self._cell_rows[:-1]]) \
+            if cells else np.empty(0, dtype=np.intp)
+        self._weighted_symbols = [self._symbols[i] for i in self._cell_rows[self._segment_starts].tolist()]
+    
     def _load_cache(self):
         """Load cached account-asset depths."""
         try:
-            with open(self.CACHE_FILE, 'r') as f:
-                self.account_asset_depths = json.load(f)
-        except (FileNotFoundError, json.JSONDecodeError):
+            self.account_asset_depths = load_json(self.CACHE_FILE)
+        except (FileNotFoundError, orjson.JSONDecodeError):
             self.account_asset_depths = {}
     
     def _save_cache(self):
         """Save account-asset depths to cache."""
-        with open(self.CACHE_FILE, 'w') as f:
-            json.dump(self.account_asset_depths, f, indent=4)
+        # The cache records what has been executed, so it must not be lost or torn.
+        # It is machine-written, so it is stored compact rather than indented.
+        write_atomic(self.CACHE_FILE, orjson.dumps(self.account_asset_depths), fsync=True)
     
     def _initialize_processors(self):
         """Initialize signal and account processors."""
-        # Get unique signal sources from config
-        signal_sources = {
-            source['source'] 
-            for symbol in self.config 
-            for source in symbol['sources']
-        }
-        
-        # Load signal processors
-        for source in signal_sources:
+        # Load signal processors for the sources indexed from the config
+        for source in self._unique_sources:
             try:
-                module = importlib.import_module(f"signal_processors.{source}_processor")
-                for name, cls in inspect.getmembers(module, inspect.isclass):
-                    if name.lower().startswith(source):
-                        self.signal_processors[source] = cls()
-                        break
+                module = _cached_import(f"{self.SIGNAL_PROCESSORS_DIR}.{source}_processor")
+                class_name = self.SIGNAL_PROCESSOR_CLASSES.get(source, f"{source[:1].upper()}{source[1:]}Processor")
+                cls = getattr(module, class_name, None)
+                if cls is None:
+                    # Fall back to scanning the module for a class named after the source
+                    cls = next(
+                        (obj for name, obj in vars(module).items()
+                         if isinstance(obj, type) and name.lower().startswith(source)),
+                        None,
+                    )
+                if cls is not None:
+                    self.signal_processors[source] = cls()
             except Exception as e:
                 logger.error(f"Error loading signal processor {source}: {e}")
         
         # Load account processors
-        for filename in os.listdir(self.ACCOUNT_PROCESSORS_DIR):
-            if filename.endswith('_processor.py'):
-                try:
-                    module_name = filename[:-3]  # Remove .py
-                    module = importlib.import_module(f"account_processors.{module_name}")
-                    for name, cls in inspect.getmembers(module, inspect.isclass):
-                        if name in ['ByBit', 'KuCoin', 'BloFin', 'MEXC']:
-                            processor = cls()
-                            self.account_processors[processor.exchange_name] = processor
-                except Exception as e:
-                    logger.error(f"Error loading account processor from {filename}: {e}")
+        for module_name, class_name in self.ACCOUNT_PROCESSORS:
+            try:
+                module = _cached_import(f"{self.ACCOUNT_PROCESSORS_DIR}.{module_name}")
+                processor = getattr(module, class_name)()
+                self.account_processors[processor.exchange_name] = processor
+            except Exception as e:
+                logger.error(f"Error loading account processor from {module_name}: {e}")
     
     def _should_reload_asset_mapping(self) -> bool:
         """Check if we should reload asset mapping configuration."""
@@ -106,138 +194,198 @@ class SignalManager:
             logger.info("Asset mapping configuration changed, reloading...")
             self._reload_asset_mappings()
 
+        # Checked once per tick: the per-account, per-asset log line is the hot one
+        log_info = logger.isEnabledFor(logging.INFO)
         updates = {}
         new_depths = {}
-        current_signals = {}
         has_updates = False
         
-        # Reload config each time to catch changes
-        self.config = self._load_config()
+        # Pick up config changes; only costs a stat call while the file is unchanged
+        config = self._load_config()
+        config_changed = config is not self.config
+        if config_changed:
+            self.config = config
+            self._rebuild_config_indexes()
+            # Stamped leverage and depth columns are laid out for the old config
+            self._signal_hashes.clear()
         
         #logger.info("\n=== Signal Source Depths ===")
         # If no accounts provided, use all known account processors
-        accounts_to_check = accounts if accounts is not None else self.account_processors.values()
+        account_by_name = {}
+        for acc in (accounts if accounts is not None else self.account_processors.values()):
+            # If an exchange is listed twice, an enabled instance wins over a disabled one
+            existing = account_by_name.get(acc.exchange_name)
+            if existing is None or (acc.enabled and not existing.enabled):
+                account_by_name[acc.exchange_name] = acc
         
-        # Track all accounts that exist in either current accounts or cache
-        all_account_names = set(acc.exchange_name for acc in accounts_to_check) | set(self.account_asset_depths.keys())
+        # Track all accounts that exist in either current accounts or cache, in a stable order
+        all_account_names = dict.fromkeys([*account_by_name, *self.account_asset_depths])
         
-        # Initialize with current depths instead of zeros
-        for account_name in all_account_names:
-            account = next((acc for acc in accounts_to_check if acc.exchange_name == account_name), None)
-            is_enabled = account.enabled if account else False
-            
-            # Start with current depths instead of zeros
-            new_depths[account_name] = self.account_asset_depths.get(account_name, {}).copy()
-            
-            # Only initialize missing symbols
-            for symbol_config in self.config:
-                symbol = symbol_config['symbol']
-                if symbol not in new_depths[account_name]:
-                    new_depths[account_name][symbol] = 0
+        # Fetch from all enabled sources concurrently on the long-lived pool; a lone
+        # source is fetched inline, handing it to a worker would only add overhead
+        enabled_processors = {
+            source: processor for source, processor in self.signal_processors.items() if processor.enabled
+        }
+        if len(enabled_processors) == 1:
+            raw_signals = {source: processor.fetch_signals() for source, processor in enabled_processors.items()}
+        else:
+            futures = {
+                source: self._fetch_executor.submit(processor.fetch_signals)
+                for source, processor in enabled_processors.items()
+            }
+            raw_signals = {source: future.result() for source, future in futures.items()}
+        # Normalize once here: anything that isn't a signal dict counts as zero depth
+        fetched_signals = {
+            source: {
+                symbol: signal if isinstance(signal, dict) else {'depth': 0}
+                for symbol, signal in signals.items()
+            }
+            for source, signals in raw_signals.items()
+        }
         
-        # Compare raw signals first
+        # Single pass over the config per source: stamp leverage, compare against the
+        # previous signals, and collect the depths that feed the weighted sums
         for source, processor in self.signal_processors.items():
-            if processor.enabled:
-                signals = processor.fetch_signals()
-                prev_signals = self.previous_signals.get(source, {})
+            if source in fetched_signals:
+                signals = fetched_signals[source]
+                
+                # Identical raw signals under the same config compare equal field by field,
+                # so keep last tick's stamped signals and depth column and skip the pass
+                signals_hash = hash(orjson.dumps(signals, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS))
+                previous_hash = self._signal_hashes.get(source)
+                self._signal_hashes[source] = signals_hash
+                if signals_hash == previous_hash and source in self.previous_signals:
+                    continue
+                
+                # Only depth and timestamp decide whether a signal changed
+                signal_keys = {
+                    symbol: (signal.get('depth', 0), signal.get('timestamp')) for symbol, signal in signals.items()
+                }
+                prev_keys = self.previous_signal_keys.get(source, _EMPTY)
                 
                 #logger.info(f"Current signals for {source}: {signals}")
-                #logger.info(f"Previous signals for {source}: {prev_signals}")
+                #logger.info(f"Previous signal keys for {source}: {prev_keys}")
                 
-                # Make sure signal.leverage is set for all signals according to self.config
-                source_has_updates = False
-                for symbol_config in self.config:
-                    symbol = symbol_config['symbol']
-                    leverage = symbol_config['leverage']
-                    
+                weighted_rows = self._weighted_rows_by_source.get(source, ())
+                depth_column = np.zeros(len(self._symbols))
+                signals_get = signals.get
+                prev_keys_get = prev_keys.get
+                for i, (symbol, leverage) in enumerate(self._leverage_by_symbol.items()):
                     # Only process symbols we care about from config
-                    if symbol in signals:
-                        signals[symbol]['leverage'] = leverage
-                        
-                        # Compare only relevant fields for this symbol
-                        curr_signal = signals.get(symbol, {})
-                        prev_signal = prev_signals.get(symbol, {})
-                        
-                        # Only consider it an update if depth or timestamp changed
-                        if (curr_signal.get('depth', 0) != prev_signal.get('depth', 0) or
-                            curr_signal.get('timestamp') != prev_signal.get('timestamp')):
-                            source_has_updates = True
-                            updates[source] = True
+                    curr_signal = signals_get(symbol)
+                    if curr_signal is None:
+                        continue
+                    
+                    # Make sure signal.leverage is set according to self.config
+                    curr_signal['leverage'] = leverage
+                    
+                    # Only consider it an update if depth or timestamp changed
+                    if signal_keys[symbol] != prev_keys_get(symbol, (0, None)):
+                        updates[source] = True
+                    
+                    if i in weighted_rows:
+                        depth_column[i] = float(curr_signal.get('depth', 0))
                 
-                current_signals[source] = signals
+                self._depth_columns[source] = depth_column
                 self.previous_signals[source] = signals
+                self.previous_signal_keys[source] = signal_keys
             else:
-                logger.info(f"Source {source} is disabled, using zero depths")
-                current_signals[source] = {}
+                logger.info("Source %s is disabled, using zero depths", source)
+        
+        # Nothing that feeds the targets changed since a tick that found no depth changes,
+        # so this tick would find none either. Unconfirmed changes keep the state unsettled.
+        state = (
+            tuple(enabled_processors),
+            tuple((name, acc.enabled) for name, acc in account_by_name.items()),
+        )
+        if not updates and not config_changed and state == self._settled_state:
+            self._temp_depths = self.account_asset_depths
+            return updates
+        
+        # Initialize with current depths instead of zeros
+        for account_name in all_account_names:
+            # Start with current depths instead of zeros; shared with the cache until modified
+            depths = self.account_asset_depths.get(account_name, _EMPTY)
+            
+            # Only initialize missing symbols
+            missing = [symbol for symbol in self._symbols if symbol not in depths]
+            if missing or depths is _EMPTY:
+                depths = {**depths, **dict.fromkeys(missing, 0)}
+            new_depths[account_name] = depths
         
         #logger.info("\n=== Weighted Asset Depths ===")
         # Calculate weighted depths for each asset
-        asset_depths = {}  # {asset: weighted_depth}
-        for symbol_config in self.config:
-            symbol = symbol_config['symbol']
-            total_weight = 0
-            weighted_sum = 0
-            
-            #logger.info(f"\n{symbol} weights:")
-            for source_config in symbol_config['sources']:
-                source = source_config['source']
-                weight = source_config['weight']
-                
-                if weight > 0:
-                    signals = current_signals.get(source, {})
-                    depth = float(signals.get(symbol, {}).get('depth', 0)) \
-                        if isinstance(signals.get(symbol), dict) else 0
-                    # weight (e.g. 0.30) defines max account allocation of entire account value
-                    # depth (e.g. 0.0235) defines what portion of that allocation to use
-                    weighted_sum += depth * weight
-                    total_weight += weight
-                    #logger.info(f"  {source}: depth={depth}, weight={weight}")
-            
-            if total_weight > 0:
-                # Final depth represents margin allocation relative to account value
-                #asset_depths[symbol] = weighted_sum / total_weight
-                asset_depths[symbol] = weighted_sum
-                #logger.info(f"  Combined depth: {asset_depths[symbol]}")
+        # D[symbol_idx, source_idx] holds the depth each source reports for each symbol;
+        # disabled or unloaded sources contribute zero depth
+        D = np.zeros((len(self._symbols), len(self._source_index)))
+        for source, j in self._source_index.items():
+            if source in fetched_signals:
+                D[:, j] = self._depth_columns[source]
+        # weight (e.g. 0.30) defines max account allocation of entire account value
+        # depth (e.g. 0.0235) defines what portion of that allocation to use
+        # The weighted sum is the final depth: margin allocation relative to account value
+        # targets[k] is the weighted depth for assets[k]
+        assets = self._weighted_symbols
+        targets = np.add.reduceat(self._cell_weights * D[self._cell_rows, self._cell_cols], self._segment_starts) \
+            if len(assets) else np.empty(0)
+        quantized_targets = _quantize_depths(targets)
+        disabled_targets = np.zeros_like(targets)
         
         #logger.info("\n=== Account Asset Depths ===")
         # Check each account for changes
         #has_updates = False
         for account_name in all_account_names:
-            account = next((acc for acc in accounts_to_check if acc.exchange_name == account_name), None)
+            account = account_by_name.get(account_name)
             is_enabled = account.enabled if account else False
-            current_depths = self.account_asset_depths.get(account_name, {})
+            current_depths = self.account_asset_depths.get(account_name, _EMPTY)
+            current_get = current_depths.get
+            currents = np.fromiter((current_get(asset, 0) for asset in assets), dtype=np.float64, count=len(assets))
+            account_targets = targets if is_enabled else disabled_targets
             
-            for asset, new_depth in asset_depths.items():
-                current_depth = current_depths.get(asset, 0)
-                target_depth = new_depth if is_enabled else 0
-                
-                # Round both depths for comparison
-                current_depth = float(current_depth)
-                target_depth = float(target_depth)
-                
-                if current_depth != target_depth:
-                    logger.info(f"Depth change detected for {account_name} on {asset}: current={current_depth}, target={target_depth}")
-                    has_updates = True
-                    new_depths[account_name][asset] = target_depth
-                    # Mark all sources for this asset as needing updates
-                    for source_config in next(
-                        sc['sources'] for sc in self.config if sc['symbol'] == asset
-                    ):
-                        updates[source_config['source']] = True
+            # Round both depths for comparison; only changed assets are visited below
+            changed = _quantize_depths(currents) != (quantized_targets if is_enabled else 0)
+            for k in np.flatnonzero(changed).tolist():
+                asset = assets[k]
+                current_depth = float(currents[k])
+                target_depth = float(account_targets[k])
+                if log_info:
+                    logger.info(
+                        "Depth change detected for %s on %s: current=%s, target=%s",
+                        account_name, asset, current_depth, target_depth,
+                    )
+                has_updates = True
+                if new_depths[account_name] is current_depths:
+                    # Copy on first write so the cached depths stay untouched until confirmed
+                    new_depths[account_name] = dict(current_depths)
+                new_depths[account_name][asset] = target_depth
+                # Mark the sources feeding this asset as needing updates
+                for source in self._symbol_sources[asset]:
+                    updates[source] = True
         
         if has_updates:
             self._temp_depths = new_depths
-            logger.info(f"Updates needed: {new_depths}")
+            self._settled_state = None
+            logger.info("Updates needed: %s", new_depths)
         else:
             self._temp_depths = self.account_asset_depths  # Use current depths if no updates
+            self._settled_state = state
             #logger.info("No depth changes detected")
         
         return updates
     
     def confirm_execution(self, account_name: str, success: bool):
-        """Confirm successful execution for an account and update its cache."""
+        """Confirm successful execution for an account and update its cached depths.
+        
+        The cache file is written by flush_confirmations(), once per batch of confirmations.
+        """
         if success and hasattr(self, '_temp_depths'):
             if account_name in self._temp_depths:
                 self.account_asset_depths[account_name] = self._temp_depths[account_name]
-                self._save_cache()
-                logger.info(f"Updated cache for {account_name}") 
\ No newline at end of file
+                self._pending_saves.add(account_name)
+                logger.info("Updated cache for %s", account_name)
+    
+    def flush_confirmations(self):
+        """Write the cache once for all executions confirmed since the last flush."""
+        if self._pending_saves:
+            self._save_cache()
+            self._pending_saves.clear()
@@ -1,6 +1,9 @@
 from dataclasses import dataclass
 
-@dataclass
+# Direction -> sign of the PnL per unit of price move
+_DIRECTION_SIGN = {"long": 1, "short": -1}
+
+@dataclass(slots=True, frozen=True)
 class UnifiedPosition:
     symbol: str  # Trading pair (e.g., BTC-USDT)
     size: float  # Size of the open position
@@ -12,11 +15,8 @@ class UnifiedPosition:
     exchange: str # Exchange (optional)            
             
     def is_profitable(self, current_price: float) -> bool:
-        if self.direction == "long":
-            return current_price > self.average_entry_price
-        elif self.direction == "short":
-            return current_price < self.average_entry_price
-        return False
+        # Unknown directions get sign 0 and are never profitable
+        return _DIRECTION_SIGN.get(self.direction, 0) * (current_price - self.average_entry_price) > 0
 
     def calculate_position_value(self, current_price: float) -> float:
         return self.size * current_price
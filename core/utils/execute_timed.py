@@ -1,23 +1,34 @@
 import asyncio
+import functools
+import inspect
+from concurrent.futures import ThreadPoolExecutor
 
-def execute_with_timeout(func, timeout=10, **kwargs):
+# Dedicated pool for blocking exchange SDK calls, so a burst of slow requests can
+# neither grow without bound nor starve the default executor other code relies on
+_io_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix="timed-io")
+
+@functools.lru_cache(maxsize=256)
+def _is_coroutine_function(func) -> bool:
+    """inspect.iscoroutinefunction, cached; the same client methods are wrapped over and over."""
+    return inspect.iscoroutinefunction(func)
+
+async def execute_with_timeout(func, timeout=10, **kwargs):
     """Execute a function with timeout.
     Args:
-        func: The function to execute
+        func: The function to execute (sync functions run in a worker thread)
         timeout: Timeout in seconds
         **kwargs: Arguments to pass to the function
     """
-    async def _execute():
-        try:
-            task = asyncio.create_task(
-                asyncio.wait_for(
-                    asyncio.to_thread(func, **kwargs),
-                    timeout=timeout
-                )
-            )
-            return await task
-        except asyncio.TimeoutError:
-            print(f"Timeout executing {func.__name__}")
-            raise
+    # Bound methods are rebuilt on every attribute access, so key the cache on the underlying function
+    if _is_coroutine_function(getattr(func, "__func__", func)):
+        call = func(**kwargs)
+    else:
+        call = asyncio.get_running_loop().run_in_executor(_io_executor, functools.partial(func, **kwargs))
 
-    return _execute()
\ No newline at end of file
+    try:
+        return await asyncio.wait_for(call, timeout=timeout)
+    except asyncio.TimeoutError:
+        # A call that already started keeps its worker until the SDK's own timeout
+        # returns; one still queued is cancelled and never runs
+        print(f"Timeout executing {func.__name__}")
+        raise
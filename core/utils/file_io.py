@@ -0,0 +1,79 @@
+import mmap
+import os
+from contextlib import contextmanager
+
+import orjson
+
+# Files above this size are memory-mapped instead of copied into a bytes object
+MMAP_THRESHOLD = 64 * 1024
+
+@contextmanager
+def read_bytes(file_path: str):
+    """Yield the contents of file_path as a bytes-like object.
+
+    Large files are served straight from the page cache through mmap; the view is
+    only valid inside the with block.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size > MMAP_THRESHOLD:
+            # orjson rejects mmap objects but accepts a memoryview over one
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as raw:
+                yield raw
+        else:
+            yield f.read()
+
+def load_json(file_path: str):
+    """Parse a JSON file with orjson, memory-mapping it when large."""
+    with read_bytes(file_path) as raw:
+        return orjson.loads(raw)
+
+def _fsync_directory(dir_path: str):
+    """Flush a directory entry change (such as a rename) to disk."""
+    # Directories can't be opened for fsync on Windows; the rename is all we get there
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def write_atomic(file_path: str, payload: bytes, fsync: bool = False):
+    """Write payload to file_path via a sibling temp file and os.replace.
+
+    Readers see either the old file or the complete new one, never a truncated write.
+    With fsync=True the data is flushed to disk before the rename and the parent
+    directory is synced after it, so the new contents survive a crash or power loss
+    right after the call.
+
+    The replaced file keeps its permission bits (new files are created 0o600, since
+    credentials.json holds API secrets), and a symlinked path has its target
+    rewritten instead of the link being replaced by a plain file.
+    """
+    target = os.path.realpath(file_path)
+    try:
+        mode = os.stat(target).st_mode & 0o7777
+    except FileNotFoundError:
+        mode = 0o600
+
+    tmp_path = f"{target}.tmp"
+    # Created owner-only, so the secrets are never readable by others, even briefly
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            if mode != 0o600:
+                os.chmod(tmp_path, mode)
+            f.write(payload)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, target)
+        if fsync:
+            _fsync_directory(os.path.dirname(target))
+    except BaseException:
+        # Don't leave a half-written temp file behind
+        try:
+            os.unlink(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
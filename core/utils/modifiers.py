@@ -1,26 +1,175 @@
-from decimal import Decimal, ROUND_DOWN
+import functools
+import math
+from decimal import Decimal
+
+import numpy as np
+
+@functools.lru_cache(maxsize=512, typed=True)
+def _step_decimal(step) -> Decimal:
+    """Parse a tick/lot size once; exchanges reuse the same handful of them."""
+    return Decimal(str(step))
+
+def _step_digits(step):
+    """Sign, digits and exponent of the step with trailing zeros stripped."""
+    parts = _step_decimal(step).as_tuple()
+    # Exchange steps like 0.01 have no trailing zeros, so normalize() is rarely needed
+    if parts.digits[-1] == 0:
+        parts = _step_decimal(step).normalize().as_tuple()
+    return parts
+
+@functools.lru_cache(maxsize=512, typed=True)
+def _step_exponent(step):
+    """Return k when step is exactly 10**-k (|k| <= 12), otherwise None."""
+    sign, digits, exponent = _step_digits(step)
+    if sign or digits != (1,) or not -12 <= exponent <= 12:
+        return None
+    return -exponent
+
+@functools.lru_cache(maxsize=512, typed=True)
+def _step_precision(step) -> int:
+    """Number of decimal places in a tick/lot size (0 for whole-number steps)."""
+    return max(0, -_step_digits(step).exponent)
+
+@functools.lru_cache(maxsize=512, typed=True)
+def _step_units(step):
+    """Return (scale, units) with step == units / scale, or None if float math can't be exact."""
+    places = _step_precision(step)
+    units = int(_step_decimal(step).scaleb(places))
+    if units <= 0 or places > 12:
+        return None
+    return 10.0 ** places, units
+
+def _keep(value):
+    return value
+
+def _float_to_decimal(value) -> Decimal:
+    # Go through str so 0.1 becomes Decimal('0.1'), not its binary expansion
+    return Decimal(str(value))
+
+# Exact type -> converter; floats become Decimals, ints and Decimals pass through
+_TO_DECIMAL = {float: _float_to_decimal, int: _keep, Decimal: _keep}
+
+def _to_decimal(value):
+    """Convert a float to Decimal for exact arithmetic, leaving ints and Decimals as they are."""
+    convert = _TO_DECIMAL.get(type(value))
+    if convert is not None:
+        return convert(value)
+    # Subclasses such as numpy.float64 miss the exact-type lookup
+    if isinstance(value, float):
+        return _float_to_decimal(value)
+    return value
+
+# Beyond this many steps a float can no longer tell neighbouring ticks apart
+_FLOAT_EXACT_STEPS = 1e15
+
+def _truncated_count(magnitude, scale):
+    """Number of 1/scale places in magnitude's shortest repr, truncated (magnitude >= 0).
+
+    Works on the decimal the float prints as, so 0.29 at scale 100 gives 29 where
+    int(0.29 * 100) gives 28. A k-place decimal d is at most the printed value
+    exactly when float(d) <= magnitude, which settles the one-off guess below.
+    """
+    count = int(magnitude * scale)
+    if (count + 1) / scale <= magnitude:
+        return count + 1
+    if count / scale > magnitude:
+        return count - 1
+    return count
+
+def quantize_to_step(value, step, rounding="down"):
+    """Snap value onto a multiple of step.
+
+    rounding="down" truncates toward zero (prices), rounding="nearest" rounds
+    half-to-even (lot sizes). Returns a float.
+    """
+    if rounding == "nearest":
+        # Round the float quotient, then trim the float noise at the step's precision
+        return float(f"%.{_step_precision(step)}f" % (round(value / step) * step))
+    if rounding != "down":
+        raise ValueError(f"Unknown rounding mode: {rounding}")
+
+    # Float and int values need no Decimal. Context.create_decimal_from_float would
+    # skip the str() below but keeps the binary expansion, turning 0.29 into 0.28
+    if type(value) in (float, int):
+        units = _step_units(step)
+        if units is not None:
+            scale, units = units
+            magnitude = abs(value)
+            if magnitude * scale < _FLOAT_EXACT_STEPS:
+                count = _truncated_count(magnitude, scale)
+                if units != 1:  # Not a power of ten (0.0005, 0.25, ...): whole steps only
+                    count = count // units * units
+                return math.copysign(count / scale, value)
+
+    value_decimal = _to_decimal(value)
+    step_decimal = _step_decimal(step)
+
+    # Floor division truncates toward zero
+    rounded_value = (value_decimal // step_decimal) * step_decimal
+    return float(rounded_value)  # Only convert to float at final step
 
 def round_to_tick_size(value, tick_size):
     """Round value to the nearest tick size with correct precision handling."""
-    if isinstance(value, float):
-        value_decimal = Decimal(str(value))
+    return quantize_to_step(value, tick_size, "down")
+
+def _step_tables(steps):
+    """Per-element exponent (NaN unless the step is 10**-k), precision and scaled step digits."""
+    unique, inverse = np.unique(steps, return_inverse=True)
+    unique = unique.tolist()
+    exponents = np.array([_step_exponent(step) for step in unique], dtype=float)
+    precisions = np.array([_step_precision(step) for step in unique], dtype=float)
+    # The step as an integer count of its last decimal place, e.g. 0.0005 -> 5
+    digits = np.array([float(_step_decimal(step).scaleb(_step_precision(step))) for step in unique])
+    inverse = inverse.reshape(-1)
+    return exponents[inverse], precisions[inverse], digits[inverse]
+
+def quantize_to_step_batch(values, steps, *, rounding="down"):
+    """Vectorized quantize_to_step over arrays of values and their steps.
+
+    Elements the float arithmetic cannot handle exactly (non power-of-ten ticks
+    when rounding down, very large values) go through quantize_to_step one by one,
+    so the result always matches the scalar helper.
+    """
+    if rounding not in ("down", "nearest"):
+        raise ValueError(f"Unknown rounding mode: {rounding}")
+    values = np.asarray(values, dtype=float).reshape(-1)
+    steps = np.broadcast_to(np.asarray(steps, dtype=float), values.shape)
+    if not values.size:
+        return values.copy()
+    exponents, precisions, digits = _step_tables(steps)
+
+    if rounding == "nearest":
+        counts = np.rint(values / steps)
+        scaled = counts * digits
+        fast = np.abs(scaled) < _FLOAT_EXACT_STEPS
+        # + 0.0 turns the -0.0 that rint gives for small negatives into 0.0, as the scalar path does
+        result = scaled / 10.0 ** precisions + 0.0
     else:
-        value_decimal = value  # Keep as Decimal if already Decimal
-    tick_size_decimal = Decimal(str(tick_size))
-    
-    # Round down to nearest tick size
-    rounded_value = (value_decimal // tick_size_decimal) * tick_size_decimal
-    return float(rounded_value)  # Only convert to float at final step
+        fast = ~np.isnan(exponents)
+        k = np.where(fast, exponents, 0.0)
+        power = 10.0 ** np.abs(k)
+        positive = k >= 0
+        magnitude = np.abs(values)
+        scaled = np.where(positive, magnitude * power, magnitude / power)
+        fast &= scaled < _FLOAT_EXACT_STEPS
+        # Nearest tick, pulled back one if it lies above the value (see _truncated_count)
+        counts = np.rint(scaled)
+        rounded = np.where(positive, counts / power, counts * power)
+        counts -= rounded > magnitude
+        result = np.copysign(np.where(positive, counts / power, counts * power), values)
+
+    slow = np.flatnonzero(~fast)
+    if slow.size:
+        for index, value, step in zip(slow.tolist(), values[slow].tolist(), steps[slow].tolist()):
+            result[index] = quantize_to_step(value, step, rounding)
+    return result
 
 def calculate_lots(size, contract_value):
     """Calculate the number of lots based on desired qty and contract value."""
-    if isinstance(size, float):
-        size_decimal = Decimal(str(size))
-    else:
-        size_decimal = size
-        
+    size_decimal = _to_decimal(size)
+
     if isinstance(contract_value, float):
-        contract_value_decimal = Decimal(str(contract_value))
+        contract_value_decimal = _step_decimal(contract_value)
     else:
         contract_value_decimal = contract_value
         
@@ -45,14 +194,28 @@ def scale_size_and_price(symbol: str, size: float, price: float, lot_size: float
     size_in_lots = float(size / contract_value)
     print(f"Size in lots: {size_in_lots}")
 
-    # Ensure minimum size
-    sign = -1 if size_in_lots < 0 else 1
-    size_in_lots = max(abs(size_in_lots), min_lots) * sign
+    # Ensure minimum size; zero sizes returned above, so the sign is never ambiguous
+    if abs(size_in_lots) < min_lots:
+        size_in_lots = min_lots if size_in_lots > 0 else -min_lots
     print(f"Size after checking min: {size_in_lots}")
     
-    # Round to lot size precision
-    decimal_places = len(str(lot_size).rsplit('.', maxsplit=1)[-1]) if '.' in str(lot_size) else 0
-    size_in_lots = float(f"%.{decimal_places}f" % (round(size_in_lots / lot_size) * lot_size))
+    # Round to the nearest lot size
+    size_in_lots = quantize_to_step(size_in_lots, lot_size, "nearest")
     print(f"Size after rounding to lot size: {size_in_lots}")
 
-    return size_in_lots, price, lot_size
\ No newline at end of file
+    return size_in_lots, price, lot_size
+
+def scale_symbols_batch(sizes, prices, lot_sizes, min_lots, tick_sizes, contract_values):
+    """Vectorized scale_size_and_price for many symbols at once.
+
+    Returns (lots, prices) arrays; symbols with a zero size get zero lots.
+    """
+    sizes = np.asarray(sizes, dtype=float)
+    prices = quantize_to_step_batch(prices, tick_sizes, rounding="down")
+
+    # Calculate lots, bump to the minimum keeping the sign, then round to the lot size
+    lots = sizes / np.asarray(contract_values, dtype=float)
+    lots = np.copysign(np.maximum(np.abs(lots), min_lots), lots)
+    lots = quantize_to_step_batch(lots, lot_sizes, rounding="nearest")
+    lots[sizes.reshape(-1) == 0] = 0.0
+    return lots, prices
@@ -238,6 +238,10 @@ class TradeExecutor:
                     logger.error(f"Error processing {account.exchange_name}: {error}")
                     all_successful = False
             
+            # Persist all confirmed depths with a single cache write, off the event loop
+            # so the fsync doesn't stall other coroutines
+            await asyncio.to_thread(self.signal_manager.flush_confirmations)
+            
             return all_successful
             
         except Exception as e:
@@ -0,0 +1,145 @@
+from decimal import Decimal
+
+import pytest
+
+from core.utils.modifiers import (
+    _FLOAT_EXACT_STEPS,
+    quantize_to_step,
+    quantize_to_step_batch,
+    round_to_tick_size,
+    scale_size_and_price,
+    scale_symbols_batch,
+)
+
+
+def _decimal_truncate(value, step):
+    """Reference: the original Decimal floor-division rounding."""
+    step_decimal = Decimal(str(step))
+    return float((Decimal(str(value)) // step_decimal) * step_decimal)
+
+
+@pytest.mark.parametrize("value, tick, expected", [
+    (0.29, 0.01, 0.29),  # int(0.29 * 100) would give 28
+    (0.57, 0.01, 0.57),
+    (1.2345, 0.01, 1.23),
+    (61234.567, 0.1, 61234.5),
+    (61234.567, 1, 61234.0),
+    (61234.567, 10, 61230.0),
+    (5, 0.01, 5.0),
+])
+def test_round_to_tick_size_power_of_ten(value, tick, expected):
+    assert round_to_tick_size(value, tick) == expected
+
+
+@pytest.mark.parametrize("value, tick, expected", [
+    (-0.29, 0.01, -0.29),
+    (-1.2345, 0.01, -1.23),  # Truncates toward zero, not toward -inf
+    (-10.6, 0.25, -10.5),
+    (-1.23499, 0.0005, -1.2345),
+])
+def test_round_to_tick_size_negative(value, tick, expected):
+    assert round_to_tick_size(value, tick) == expected
+
+
+def test_round_to_tick_size_negative_zero_keeps_sign():
+    assert str(round_to_tick_size(-0.001, 0.01)) == "-0.0"
+
+
+@pytest.mark.parametrize("value, tick, expected", [
+    (1.2349, 0.0005, 1.2345),
+    (1.2345, 0.0005, 1.2345),
+    (10.6, 0.25, 10.5),
+    (10.75, 0.25, 10.75),
+    (0.3, 0.2, 0.2),
+    (123.0, 50, 100.0),
+])
+def test_round_to_tick_size_non_power_of_ten(value, tick, expected):
+    assert round_to_tick_size(value, tick) == expected
+
+
+@pytest.mark.parametrize("value, tick", [
+    (123456789012345.67, 0.01),
+    (-98765432109876.54, 0.01),
+    (1e20 + 12345.0, 0.5),
+])
+def test_round_to_tick_size_above_float_exact_steps_falls_back_to_decimal(value, tick):
+    assert abs(value) / tick >= _FLOAT_EXACT_STEPS
+    assert round_to_tick_size(value, tick) == _decimal_truncate(value, tick)
+
+
+def test_round_to_tick_size_decimal_input():
+    assert round_to_tick_size(Decimal("1.239"), 0.01) == 1.23
+
+
+@pytest.mark.parametrize("value", [0.29, 1.005, 2.675, -3.14159, 99999.99999, 1e-7, 12345678.9])
+@pytest.mark.parametrize("tick", [0.1, 0.01, 1e-05, 1e-08, 1, 0.5, 0.0005, 0.25, 5])
+def test_round_to_tick_size_matches_decimal_reference(value, tick):
+    assert repr(round_to_tick_size(value, tick)) == repr(_decimal_truncate(value, tick))
+
+
+def test_quantize_to_step_rejects_unknown_rounding():
+    with pytest.raises(ValueError):
+        quantize_to_step(1.0, 0.1, "up")
+
+
+def test_quantize_to_step_nearest():
+    assert quantize_to_step(0.126, 0.01, "nearest") == 0.13
+    assert quantize_to_step(-0.126, 0.01, "nearest") == -0.13
+    assert quantize_to_step(0.74, 0.5, "nearest") == 0.5
+
+
+def test_scale_size_and_price_small_exponent_lot_size(capsys):
+    # str(1e-05) is '1e-05'; this used to be read as 0 decimal places and rounded to 0 lots
+    lots, price, lot_size = scale_size_and_price("BTCUSDT", 0.123456, 61234.567, 1e-05, 1e-05, 0.1, 1)
+    assert lots == 0.12346
+    assert price == 61234.5
+    assert lot_size == 1e-05
+
+
+def test_scale_size_and_price_min_lots_keeps_sign(capsys):
+    assert scale_size_and_price("BTCUSDT", 0.0001, 0, 0.001, 0.01, 0.1, 1)[0] == 0.01
+    assert scale_size_and_price("BTCUSDT", -0.0001, 0, 0.001, 0.01, 0.1, 1)[0] == -0.01
+
+
+def test_scale_size_and_price_zero_size(capsys):
+    assert scale_size_and_price("BTCUSDT", 0, 100.05, 0.001, 0.01, 0.1, 1)[:2] == (0, 100.0)
+
+
+_BATCH_VALUES = [
+    0.29, -0.29, 1.2349, -10.6, 0.0, -0.0, 0.126, -0.126, 2.675, 61234.567,
+    123456789012345.67, -98765432109876.54, 1e-7, 0.74, 10.75, 5.0,
+]
+_BATCH_STEPS = [0.01, 0.0005, 0.25, 1e-05, 0.1, 1, 10, 0.5]
+
+
+@pytest.mark.parametrize("rounding", ["down", "nearest"])
+def test_quantize_to_step_batch_matches_scalar(rounding):
+    values = [v for v in _BATCH_VALUES for _ in _BATCH_STEPS]
+    steps = _BATCH_STEPS * len(_BATCH_VALUES)
+    result = quantize_to_step_batch(values, steps, rounding=rounding)
+    expected = [quantize_to_step(v, s, rounding) for v, s in zip(values, steps)]
+    assert [repr(x) for x in result.tolist()] == [repr(x) for x in expected]
+
+
+def test_quantize_to_step_batch_empty():
+    assert quantize_to_step_batch([], [], rounding="down").size == 0
+
+
+def test_quantize_to_step_batch_rejects_unknown_rounding():
+    with pytest.raises(ValueError):
+        quantize_to_step_batch([1.0], [0.1], rounding="up")
+
+
+def test_scale_symbols_batch_matches_scalar(capsys):
+    sizes = [0.123456, -0.0001, 0.0, 12.5, -3.333, 250.0]
+    prices = [61234.567, 2.675, 100.05, 0.29, 1.2349, 10.6]
+    lot_sizes = [1e-05, 0.001, 0.001, 0.5, 0.01, 10]
+    min_lots = [1e-05, 0.01, 0.01, 0.5, 0.01, 10]
+    tick_sizes = [0.1, 0.01, 0.1, 0.01, 0.0005, 0.25]
+    contract_values = [1, 1, 1, 0.1, 0.01, 1.0]
+
+    lots, scaled_prices = scale_symbols_batch(sizes, prices, lot_sizes, min_lots, tick_sizes, contract_values)
+    for i, args in enumerate(zip(sizes, prices, lot_sizes, min_lots, tick_sizes, contract_values)):
+        expected_lots, expected_price, _ = scale_size_and_price("SYM", *args)
+        assert lots[i] == expected_lots
+        assert scaled_prices[i] == expected_price